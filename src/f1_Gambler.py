@@ -1,5 +1,3 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
 import csv
 import random
 from dataclasses import dataclass
@@ -7,6 +5,22 @@ from typing import List, Optional, Tuple, Dict
 import json
 from datetime import datetime
 import os
+import sys
+import queue
+import shlex
+import unicodedata
+
+# Front ends - either may be missing on headless or Windows machines
+try:
+    import tkinter as tk
+    from tkinter import ttk, messagebox, filedialog
+except ImportError:
+    tk = None
+
+try:
+    import curses
+except ImportError:
+    curses = None
 
 # Import live tracker functions
 from selenium import webdriver
@@ -16,6 +30,29 @@ from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 import time
 import threading
+import multiprocessing
+import signal
+import subprocess
+import shutil
+import re
+from functools import lru_cache
+
+# Optional: per-process memory and child tracking for the scraping browser
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# File locking for the shared snapshot cache (fcntl on POSIX, msvcrt on Windows)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
 
 # 2025 Driver lineup with teams
 DRIVER_CODES = {
@@ -44,43 +81,1281 @@ DRIVER_CODES = {
 # F1 Points system
 POINTS_SYSTEM = {1: 25, 2: 18, 3: 15, 4: 12, 5: 10, 6: 8, 7: 6, 8: 4, 9: 2, 10: 1}
 
+DASHBOARD_URL = "https://f1-dash.com/dashboard"
+
+# Pin a local chromedriver binary; when set the driver is never downloaded
+CHROMEDRIVER_PATH = os.environ.get("F1_CHROMEDRIVER_PATH")
+
+# Official classification files used instead of scraping at lock / finish
+GRID_FILE = os.environ.get("F1_GRID_FILE")
+RESULTS_FILE = os.environ.get("F1_RESULTS_FILE")
+
+# Classification statuses that count as a DNF - like the live scraper, only
+# cars that stopped during the race
+DNF_STATUSES = {"DNF", "RET", "RETIRED", "STOPPED"}
+
+# Classification statuses left out of the results without counting as a DNF
+UNCLASSIFIED_STATUSES = {"DNS", "DSQ", "NC"}
+
+# Game processes scraping the same race share snapshots under this key
+RACE_SESSION = "sao-paulo-gp-2025"
+
+# Per-user data directory, never shared with other accounts on the machine
+APP_DIR = os.path.join(os.path.expanduser("~"), ".f1_game_time")
+
+# Resolved chromedriver path and version, reused across runs
+DRIVER_CACHE_FILE = os.path.join(APP_DIR, "chromedriver.json")
+
+
+@dataclass
+class Player:
+    name: str
+    dnf_prediction: int
+    team_prediction: str
+    assigned_drivers: List[str]
+    dnf_score: Optional[int] = None
+    team_score: Optional[int] = None
+    places_gained_score: Optional[int] = None
+    categories_won: Optional[int] = None
+
+
+@dataclass
+class RaceSnapshot:
+    positions: Dict[str, int]
+    dnf_drivers: set
+    team_points: Dict[str, int]
+    category_leaders: Dict[str, List[str]]
+
+
+@dataclass
+class PositionChange:
+    driver: str
+    old_position: int
+    new_position: int
+    passed: List[str]
+    
+    def describe(self) -> str:
+        if self.passed:
+            return f"{self.driver} passed {', '.join(self.passed)} (P{self.new_position})"
+        return f"{self.driver} P{self.old_position} -> P{self.new_position}"
+
+
+@dataclass
+class Retirement:
+    driver: str
+    last_position: Optional[int]
+    
+    def describe(self) -> str:
+        return f"{self.driver} STOPPED"
+
+
+@dataclass
+class TeamLeadChange:
+    old_team: Optional[str]
+    new_team: str
+    points: int
+    
+    def describe(self) -> str:
+        return f"{self.new_team} lead the teams ({self.points} pts)"
+
+
+@dataclass
+class CategoryLeaderChange:
+    category: str
+    old_leaders: List[str]
+    new_leaders: List[str]
+    
+    def describe(self) -> str:
+        return f"{self.category} leader: {', '.join(self.new_leaders) or 'None'}"
+
+
+def binary_version(path) -> Optional[str]:
+    """Version printed by a local chrome or chromedriver binary"""
+    try:
+        output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r"\d+(\.\d+)+", output)
+    return match.group(0) if match else None
+
+
+def local_chrome_version() -> Optional[str]:
+    """Version of the installed Chrome/Chromium, found without network access"""
+    if sys.platform == "win32":
+        try:
+            import winreg
+            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon")
+            return winreg.QueryValueEx(key, "version")[0]
+        except OSError:
+            return None
+    
+    candidates = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser",
+                  "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"]
+    for candidate in candidates:
+        path = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+        if path:
+            version = binary_version(path)
+            if version:
+                return version
+    return None
+
+
+def major_version(version) -> Optional[str]:
+    return version.split(".")[0] if version else None
+
+
+@lru_cache(maxsize=None)
+def resolve_chromedriver() -> str:
+    """Path to a chromedriver matching the local browser - pinned, cached, or downloaded once"""
+    if CHROMEDRIVER_PATH:
+        if not os.path.isfile(CHROMEDRIVER_PATH):
+            raise FileNotFoundError(f"F1_CHROMEDRIVER_PATH does not exist: {CHROMEDRIVER_PATH}")
+        return CHROMEDRIVER_PATH
+    
+    browser_version = local_chrome_version()
+    
+    try:
+        with open(DRIVER_CACHE_FILE, encoding='utf-8') as f:
+            cached = json.load(f)
+        if os.path.isfile(cached['path']) and (
+                browser_version is None
+                or major_version(cached['version']) == major_version(browser_version)):
+            return cached['path']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    
+    path = ChromeDriverManager().install()
+    
+    try:
+        os.makedirs(os.path.dirname(DRIVER_CACHE_FILE), mode=0o700, exist_ok=True)
+        with open(DRIVER_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({
+                'path': path,
+                'version': binary_version(path),
+                'browser_version': browser_version,
+                'resolved_at': datetime.now().isoformat(timespec='seconds')
+            }, f, indent=2)
+    except OSError:
+        pass
+    
+    return path
+
+
+def create_chrome_driver():
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    
+    service = Service(resolve_chromedriver())
+    return webdriver.Chrome(service=service, options=chrome_options)
+
+
+def parse_live_positions(html_content, detect_dnf=False) -> Tuple[Dict[str, int], set, Dict[str, int]]:
+    """Parse the f1-dash dashboard HTML into positions, DNFs and team points"""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    text_content = soup.get_text()
+    
+    driver_positions = []
+    
+    for code in DRIVER_CODES.keys():
+        index = text_content.find(code)
+        if index != -1:
+            driver_positions.append((index, code))
+    
+    driver_positions.sort(key=lambda x: x[0])
+    
+    positions = {}
+    dnf_set = set()
+    team_points = {}
+    
+    for i, (pos_index, driver_code) in enumerate(driver_positions):
+        if len(positions) >= 20:
+            break
+    
+        driver_name, team_name = DRIVER_CODES[driver_code]
+    
+        if detect_dnf:
+            if i == len(driver_positions) - 1:
+                next_section = text_content[pos_index:pos_index + 200]
+                if "STOPPED" in next_section:
+                    dnf_set.add(driver_name)
+            else:
+                next_pos_index = driver_positions[i + 1][0]
+                section_between = text_content[pos_index:next_pos_index]
+    
+                if "STOPPED" in section_between:
+                    dnf_set.add(driver_name)
+    
+        if driver_name not in dnf_set:
+            race_position = len(positions) + 1
+            positions[driver_name] = race_position
+    
+            if race_position in POINTS_SYSTEM:
+                points = POINTS_SYSTEM[race_position]
+                team_points[team_name] = team_points.get(team_name, 0) + points
+    
+    return positions, dnf_set, team_points
+
+
+def scrape_worker_main(conn):
+    """Scrape worker process: keeps one browser open for the session and
+    answers each fetch request with the parsed positions"""
+    if hasattr(os, "setpgrp"):
+        # Own process group so the supervisor can kill the whole browser tree
+        os.setpgrp()
+    
+    driver = None
+    try:
+        while True:
+            detect_dnf = conn.recv()
+            if detect_dnf is None:
+                break
+            
+            try:
+                if driver is None:
+                    driver = create_chrome_driver()
+                driver.get(DASHBOARD_URL)
+                time.sleep(1)
+                conn.send(("ok", parse_live_positions(driver.page_source, detect_dnf)))
+            except Exception as e:
+                # The browser may be in a bad state, start a fresh one next time
+                if driver is not None:
+                    try:
+                        driver.quit()
+                    except Exception:
+                        pass
+                    driver = None
+                conn.send(("error", f"{type(e).__name__}: {e}"))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        if driver is not None:
+            driver.quit()
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class CircuitBreaker:
+    """Stops calling a failing service for a cool-down period after repeated failures"""
+    def __init__(self, max_failures=3, cooldown=60):
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+    
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+    
+    def retry_in(self) -> int:
+        if self.opened_at is None:
+            return 0
+        return max(0, int(self.cooldown - (time.monotonic() - self.opened_at)))
+    
+    def allow(self) -> bool:
+        # Once the cool-down has passed a single trial call is let through
+        return self.opened_at is None or self.retry_in() == 0
+    
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+    
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.max_failures:
+            self.opened_at = time.monotonic()
+
+
+class ScrapeWorker:
+    """Runs fetching and HTML parsing in a separate process so the GUI never
+    waits on the GIL, and supervises the browser that process owns: calls
+    have deadlines, the worker and its chrome/chromedriver children are
+    killed as a group when a call overruns or memory runs away, the browser
+    is recycled periodically and a circuit breaker pauses scraping after
+    repeated failures"""
+    def __init__(self, timeout=45, max_fetches=50, recycle_rss_mb=1024, kill_rss_mb=2048,
+                 max_failures=3, cooldown=60):
+        self.timeout = timeout
+        self.max_fetches = max_fetches
+        self.recycle_rss_mb = recycle_rss_mb
+        self.kill_rss_mb = kill_rss_mb
+        self.breaker = CircuitBreaker(max_failures, cooldown)
+        self.process = None
+        self.conn = None
+        self.fetch_count = 0
+        self.lock = threading.Lock()
+    
+    def start(self):
+        parent_conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=scrape_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.fetch_count = 0
+    
+    def processes(self) -> list:
+        """The worker and every browser process below it (needs psutil)"""
+        if psutil is None or self.process is None:
+            return []
+        try:
+            worker = psutil.Process(self.process.pid)
+            return [worker] + worker.children(recursive=True)
+        except psutil.Error:
+            return []
+    
+    def rss_mb(self, processes=None) -> float:
+        total = 0
+        for proc in self.processes() if processes is None else processes:
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                pass
+        return total / (1024 * 1024)
+    
+    def kill(self):
+        """Kill the worker together with its chrome and chromedriver children"""
+        if self.process is None:
+            return
+        
+        for proc in reversed(self.processes()):
+            try:
+                proc.kill()
+            except psutil.Error:
+                pass
+        
+        if hasattr(os, "killpg"):
+            # The worker leads its own process group, which the browser inherits;
+            # this also reaches children already reparented away from a dead worker
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=2)
+    
+    def stop(self, graceful=True):
+        if self.process is None:
+            return
+        
+        # Remember the browser processes so none are left behind as orphans
+        leftovers = self.processes()[1:]
+        
+        if graceful:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(timeout=5)
+        
+        # Always sweep the process group so no browser outlives the worker
+        self.kill()
+        
+        for proc in leftovers:
+            try:
+                proc.kill()
+            except psutil.Error:
+                pass
+        
+        self.conn.close()
+        self.process = None
+        self.conn = None
+    
+    def restart(self, graceful=True):
+        self.stop(graceful)
+        self.start()
+    
+    def status_text(self) -> str:
+        if self.breaker.is_open:
+            return f"Scraper paused after {self.breaker.failures} failures (retry in {self.breaker.retry_in()}s)"
+        if self.process is None:
+            return "Browser: stopped"
+        if psutil is None:
+            return "Browser: running"
+        
+        processes = self.processes()
+        return f"Browser: {len(processes)} procs, {self.rss_mb(processes):.0f} MB"
+    
+    def fetch(self, detect_dnf=False) -> Tuple[Dict[str, int], set, Dict[str, int]]:
+        with self.lock:
+            if not self.breaker.allow():
+                raise CircuitOpenError(f"Scraping paused after {self.breaker.failures} failures, "
+                                       f"retrying in {self.breaker.retry_in()}s")
+            
+            try:
+                result = self.request(detect_dnf)
+            except Exception:
+                self.breaker.record_failure()
+                raise
+            
+            self.breaker.record_success()
+            self.fetch_count += 1
+            return result
+    
+    def request(self, detect_dnf):
+        if self.process is None or not self.process.is_alive():
+            self.stop(graceful=False)
+            self.start()
+        elif self.fetch_count >= self.max_fetches or (psutil and self.rss_mb() > self.recycle_rss_mb):
+            self.restart()
+        
+        try:
+            self.conn.send(detect_dnf)
+        except (BrokenPipeError, OSError):
+            self.restart(graceful=False)
+            self.conn.send(detect_dnf)
+        
+        deadline = time.monotonic() + self.timeout
+        while not self.conn.poll(1):
+            if time.monotonic() >= deadline:
+                self.restart(graceful=False)
+                raise TimeoutError(f"No response from f1-dash within {self.timeout}s, scraper restarted")
+            
+            if psutil and self.rss_mb() > self.kill_rss_mb:
+                self.restart(graceful=False)
+                raise RuntimeError(f"Browser exceeded {self.kill_rss_mb} MB, scraper restarted")
+        
+        try:
+            status, payload = self.conn.recv()
+        except EOFError:
+            self.restart(graceful=False)
+            raise RuntimeError("Scrape worker died, scraper restarted")
+        
+        if status == "error":
+            raise RuntimeError(payload)
+        return payload
+
+
+class SharedSnapshotCache:
+    """Latest parsed snapshot shared through the user's private data directory
+    by every game process they run, so only one of them scrapes per TTL window"""
+    def __init__(self, session=RACE_SESSION, ttl=10, lock_timeout=90, directory=None):
+        self.directory = directory or os.path.join(APP_DIR, "snapshots")
+        self.prefix = os.path.join(self.directory, re.sub(r"[^\w-]", "_", session))
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self.token = f"{os.getpid()}-{id(self)}"
+    
+    def paths(self, detect_dnf) -> Tuple[str, str]:
+        base = f"{self.prefix}_{'race' if detect_dnf else 'grid'}"
+        return base + ".json", base + ".lock"
+    
+    def read(self, detect_dnf) -> Optional[Tuple[Dict[str, int], set, Dict[str, int]]]:
+        path, _ = self.paths(detect_dnf)
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            if time.time() - data['fetched_at'] > self.ttl:
+                return None
+            return data['positions'], set(data['dnf_drivers']), data['team_points']
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    
+    def write(self, detect_dnf, result):
+        path, _ = self.paths(detect_dnf)
+        positions, dnf_drivers, team_points = result
+        tmp_path = f"{path}.{self.token}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'fetched_at': time.time(),
+                'positions': positions,
+                'dnf_drivers': sorted(dnf_drivers),
+                'team_points': team_points
+            }, f)
+        # Readers never see a half-written snapshot
+        os.replace(tmp_path, path)
+    
+    def acquire(self, lock_path):
+        """Non-blocking OS lock on the lock file, which the OS releases if the
+        owner dies; returns the open handle, or None when another process holds it"""
+        handle = open(lock_path, 'a+')
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            elif msvcrt is not None:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            handle.close()
+            return None
+        return handle
+    
+    def release(self, handle):
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        handle.close()
+    
+    def get_or_fetch(self, detect_dnf, fetch) -> Tuple[Dict[str, int], set, Dict[str, int]]:
+        """Fresh cached snapshot if there is one, otherwise fetch it once for everybody"""
+        cached = self.read(detect_dnf)
+        if cached is not None:
+            return cached
+        
+        _, lock_path = self.paths(detect_dnf)
+        deadline = time.monotonic() + self.lock_timeout
+        
+        # A cache that cannot be used (permissions, full disk...) never blocks a refresh
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            handle = self.acquire(lock_path)
+        except OSError:
+            return fetch()
+        
+        # A hung owner is waited out for lock_timeout, then everyone fetches alone
+        while handle is None:
+            time.sleep(0.1)
+            cached = self.read(detect_dnf)
+            if cached is not None:
+                return cached
+            if time.monotonic() >= deadline:
+                return fetch()
+            try:
+                handle = self.acquire(lock_path)
+            except OSError:
+                return fetch()
+        
+        try:
+            # Another process may have finished its fetch just before we got the lock
+            cached = self.read(detect_dnf)
+            if cached is not None:
+                return cached
+            
+            result = fetch()
+            try:
+                self.write(detect_dnf, result)
+            except OSError:
+                pass
+            return result
+        finally:
+            self.release(handle)
+
+
+class RowsFileError(ValueError):
+    """Raised with every invalid row of an imported file at once"""
+    what = "invalid row"
+    
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} {self.what}(s):\n" + "\n".join(errors))
+        self.errors = errors
+
+
+class BetImportError(RowsFileError):
+    what = "invalid bet"
+
+
+class ClassificationError(RowsFileError):
+    what = "classification problem"
+
+
+def clean_text(value) -> str:
+    """Single-line text with control characters (e.g. newlines from quoted CSV fields) removed"""
+    return " ".join("".join(ch if ch.isprintable() else " " for ch in str(value)).split())
+
+
+def whole_number(value) -> Optional[int]:
+    """Integer value of a file field, or None for bools, fractions and text"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else None
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return None
+
+
+def load_rows_file(path, list_key, error_class) -> List[Tuple[str, dict]]:
+    """Rows of a CSV or JSON import file with lower-cased keys, labelled for error reporting"""
+    # utf-8-sig strips the byte order mark Excel puts in front of CSV headers
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        if path.lower().endswith('.json'):
+            data = json.load(f)
+            if isinstance(data, dict):
+                data = data.get(list_key)
+            if not isinstance(data, list):
+                raise error_class([f"expected a list of objects or an object with a '{list_key}' list"])
+            rows = [(f"Entry {i}", row) for i, row in enumerate(data, 1)]
+        else:
+            reader = csv.DictReader(f)
+            rows = [(f"Line {reader.line_num}", row) for row in reader]
+    
+    if not rows:
+        raise error_class(["the file contains no rows"])
+    
+    return [(label, {str(key).strip().lower(): value for key, value in row.items()}
+             if isinstance(row, dict) else row)
+            for label, row in rows]
+
+
+def load_classification(path) -> Tuple[Dict[str, int], set, Dict[str, int]]:
+    """Read an official classification (CSV or JSON with position, driver code
+    and optional status) into the same positions, DNFs and team points a scrape returns"""
+    rows = load_rows_file(path, 'classification', ClassificationError)
+    
+    errors = []
+    classified = {}
+    positions = set()
+    dnf_set = set()
+    seen = set()
+    
+    for label, row in rows:
+        if not isinstance(row, dict):
+            errors.append(f"{label}: expected an object with position and driver")
+            continue
+        
+        code = str(row.get('driver') or '').strip().upper()
+        status = str(row.get('status') or '').strip().upper()
+        
+        if code not in DRIVER_CODES:
+            errors.append(f"{label}: unknown driver code '{code}'")
+            continue
+        if code in seen:
+            errors.append(f"{label}: {code} is listed twice")
+            continue
+        seen.add(code)
+        
+        if status in DNF_STATUSES:
+            dnf_set.add(DRIVER_CODES[code][0])
+            continue
+        if status in UNCLASSIFIED_STATUSES:
+            continue
+        
+        position = whole_number(row.get('position'))
+        if position is None:
+            errors.append(f"{label}: {code} has invalid position '{row.get('position')}'")
+            continue
+        
+        if position in positions:
+            errors.append(f"{label}: position {position} is given twice")
+            continue
+        positions.add(position)
+        classified[code] = position
+    
+    expected = set(range(1, len(classified) + 1))
+    if not errors and positions != expected:
+        missing = sorted(expected - positions)
+        errors.append(f"classified positions must run 1-{len(classified)}, missing {missing}")
+    
+    if not classified and not errors:
+        errors.append("no classified drivers")
+    
+    if errors:
+        raise ClassificationError(errors)
+    
+    team_points = {}
+    for code, position in classified.items():
+        if position in POINTS_SYSTEM:
+            team_name = DRIVER_CODES[code][1]
+            team_points[team_name] = team_points.get(team_name, 0) + POINTS_SYSTEM[position]
+    
+    return {DRIVER_CODES[code][0]: position for code, position in classified.items()}, dnf_set, team_points
+
+
+class RaceEventBus:
+    """Delivers race events to the subscribers registered for their type"""
+    def __init__(self):
+        self.subscribers = {}
+    
+    def subscribe(self, event_type, callback):
+        self.subscribers.setdefault(event_type, []).append(callback)
+    
+    def publish(self, events):
+        for event in events:
+            for callback in self.subscribers.get(type(event), []):
+                callback(event)
+
+
+def leading_team(team_points: Dict[str, int]) -> Optional[str]:
+    if not team_points:
+        return None
+    return max(team_points.items(), key=lambda x: x[1])[0]
+
+
+def diff_snapshots(previous: RaceSnapshot, current: RaceSnapshot) -> list:
+    """Turn two consecutive race snapshots into typed race events"""
+    events = []
+    
+    for driver in sorted(current.dnf_drivers - previous.dnf_drivers):
+        events.append(Retirement(driver, previous.positions.get(driver)))
+    
+    # Only real overtakes: places gained because cars ahead retired, and the
+    # places lost by the overtaken car, are not reported as position changes
+    for driver, new_pos in sorted(current.positions.items(), key=lambda x: x[1]):
+        old_pos = previous.positions.get(driver)
+        if old_pos is None or new_pos >= old_pos:
+            continue
+        
+        passed = [other for other, other_old in sorted(previous.positions.items(), key=lambda x: x[1])
+                  if other_old < old_pos and other in current.positions
+                  and current.positions[other] > new_pos]
+        if passed:
+            events.append(PositionChange(driver, old_pos, new_pos, passed))
+    
+    old_leader = leading_team(previous.team_points)
+    new_leader = leading_team(current.team_points)
+    if new_leader and new_leader != old_leader:
+        events.append(TeamLeadChange(old_leader, new_leader, current.team_points[new_leader]))
+    
+    for category, leaders in current.category_leaders.items():
+        old_leaders = previous.category_leaders.get(category, [])
+        if sorted(leaders) != sorted(old_leaders):
+            events.append(CategoryLeaderChange(category, old_leaders, leaders))
+    
+    return events
+
+
+class RaceGame:
+    """Game state, data fetching and scoring shared by every front end"""
+    LEADERBOARD_TILES = 10
+    
+    def __init__(self):
+        self.players = []
+        self.all_drivers = [name for name, team in DRIVER_CODES.values()]
+        self.teams = [
+            "Red Bull Racing", "Mercedes", "Ferrari", "McLaren",
+            "Aston Martin", "Alpine", "Williams", "Kick Sauber",
+            "Haas", "Racing Bulls"
+        ]
+        
+        self.phase = "betting"
+        self.starting_grid = {}
+        self.current_positions = {}
+        self.dnf_drivers = set()
+        self.team_points = {}
+        self.winning_team = None
+        self.category_winners = {}
+        self.refresh_count = 0
+        self.actual_dnf_count = 0
+        
+        # Browser and parsing live in their own process for the whole session
+        self.scraper = ScrapeWorker()
+        self.snapshot_cache = SharedSnapshotCache()
+        
+        # Race events are computed by diffing consecutive snapshots
+        self.event_bus = RaceEventBus()
+        self.last_snapshot = None
+        self.event_log = []
+        self.headlines = []
+        self.event_bus.subscribe(PositionChange, self.log_race_event)
+        self.event_bus.subscribe(CategoryLeaderChange, self.log_race_event)
+        self.event_bus.subscribe(Retirement, self.log_headline)
+        self.event_bus.subscribe(TeamLeadChange, self.log_headline)
+        
+    def scrape_live_positions(self, detect_dnf=False) -> Tuple[Dict[str, int], set, Dict[str, int]]:
+        """Scrape live positions from f1-dash.com via the scrape worker process,
+        or reuse the snapshot another game process fetched moments ago"""
+        return self.snapshot_cache.get_or_fetch(detect_dnf, lambda: self.scraper.fetch(detect_dnf))
+    
+    def load_starting_grid(self, grid_file=None) -> Dict[str, int]:
+        """Starting grid from a qualifying classification file, scraped live when there is none"""
+        if grid_file:
+            starting_grid, _, _ = load_classification(grid_file)
+        else:
+            starting_grid, _, _ = self.scrape_live_positions(detect_dnf=False)
+        return starting_grid
+    
+    def load_final_results(self, results_file=None) -> Tuple[Dict[str, int], set, Dict[str, int]]:
+        """Final classification from a results file, scraped live when there is none"""
+        if results_file:
+            return load_classification(results_file)
+        return self.scrape_live_positions(detect_dnf=True)
+    
+    def close(self):
+        self.scraper.stop()
+    
+    def drivers_text(self, player) -> str:
+        driver_text = ""
+        for driver in player.assigned_drivers:
+            if driver in self.dnf_drivers:
+                driver_text += f"[DNF] {driver}, "
+            else:
+                driver_text += f"{driver}, "
+        return driver_text.rstrip(", ")
+    
+    def add_bet(self, name, dnf, team) -> Player:
+        """Validate a bet and add the player with two random drivers, unused ones first"""
+        name = clean_text(name)
+        if not name:
+            raise ValueError("Please enter player name!")
+        
+        if team not in self.teams:
+            raise ValueError("Please select a team!")
+        
+        if not 0 <= dnf <= 20:
+            raise ValueError("DNF prediction must be between 0 and 20!")
+        
+        player = Player(name, dnf, team, [])
+        self.assign_drivers_bulk([player])
+        self.players.append(player)
+        return player
+    
+    def shuffle_drivers(self):
+        for player in self.players:
+            player.assigned_drivers = []
+        self.assign_drivers_bulk(self.players)
+    
+    def assign_drivers_bulk(self, players):
+        """Give each player two drivers, handing out unused drivers first and
+        dealing from a freshly shuffled field once they run out"""
+        used_drivers = {d for p in self.players for d in p.assigned_drivers}
+        pool = [d for d in self.all_drivers if d not in used_drivers]
+        random.shuffle(pool)
+        
+        for player in players:
+            if len(pool) < 2:
+                refill = self.all_drivers.copy()
+                random.shuffle(refill)
+                pool = refill + pool
+            
+            first = pool.pop()
+            second_index = max(i for i, d in enumerate(pool) if d != first)
+            player.assigned_drivers = [first, pool.pop(second_index)]
+    
+    def import_bets(self, path) -> List[Player]:
+        """Validate every row of a bets file in one pass, then add all players at once"""
+        teams = {team.lower(): team for team in self.teams}
+        names = {p.name.lower() for p in self.players}
+        new_players = []
+        errors = []
+        
+        for label, row in load_rows_file(path, 'players', BetImportError):
+            if not isinstance(row, dict):
+                errors.append(f"{label}: expected an object with name, dnf and team")
+                continue
+            
+            name = clean_text(row.get('name') or '')
+            team = teams.get(str(row.get('team') or '').strip().lower())
+            dnf = row.get('dnf', row.get('dnf_prediction'))
+            
+            row_errors = []
+            if not name:
+                row_errors.append("missing name")
+            elif name.lower() in names:
+                row_errors.append(f"duplicate player '{name}'")
+            
+            dnf_value = whole_number(dnf)
+            if dnf_value is None:
+                row_errors.append(f"invalid DNF prediction '{dnf}'")
+            elif not 0 <= dnf_value <= 20:
+                row_errors.append(f"DNF prediction {dnf_value} not in 0-20")
+            dnf = dnf_value
+            
+            if team is None:
+                row_errors.append(f"unknown team '{row.get('team', '')}'")
+            
+            if row_errors:
+                errors.append(f"{label}: {', '.join(row_errors)}")
+                continue
+            
+            names.add(name.lower())
+            new_players.append(Player(name, dnf, team, []))
+        
+        if errors:
+            raise BetImportError(errors)
+        
+        self.assign_drivers_bulk(new_players)
+        self.players.extend(new_players)
+        return new_players
+    
+    def start_race(self, starting_grid):
+        """Lock bets against the given starting grid and reset all scores"""
+        self.starting_grid = starting_grid
+        self.phase = "race"
+        
+        self.actual_dnf_count = 0
+        self.dnf_drivers = set()
+        self.team_points = {}
+        self.winning_team = None
+        for player in self.players:
+            player.places_gained_score = 0
+            player.dnf_score = 0
+            player.team_score = 0
+            player.categories_won = 0
+        
+        self.last_snapshot = RaceSnapshot(dict(self.starting_grid), set(), {}, {})
+        self.event_log = []
+        self.headlines = []
+    
+    def apply_positions(self, positions, dnf_drivers, team_points):
+        self.current_positions = positions
+        self.dnf_drivers = dnf_drivers
+        self.team_points = team_points
+        self.actual_dnf_count = len(self.dnf_drivers)
+        
+        if self.team_points:
+            self.winning_team = leading_team(self.team_points)
+    
+    def category_rankings(self) -> List[Tuple[str, List[Tuple[Player, str]]]]:
+        """Every player ranked per category, paired with the score text to show"""
+        dnf_rankings = sorted(self.players, 
+                             key=lambda p: abs(p.dnf_prediction - self.actual_dnf_count))
+        
+        places_rankings = sorted(self.players, 
+                                key=lambda p: p.places_gained_score if p.places_gained_score else 0, 
+                                reverse=True)
+        
+        if self.winning_team and self.team_points:
+            def team_closeness(player):
+                return self.team_points.get(player.team_prediction, 0)
+            
+            team_rankings = sorted(self.players, key=team_closeness, reverse=True)
+        else:
+            team_rankings = self.players.copy()
+        
+        categories = [
+            ("DNF Predictions", dnf_rankings),
+            ("Places Gained", places_rankings),
+            ("Team Predictions", team_rankings)
+        ]
+        
+        results = []
+        for category_name, rankings in categories:
+            entries = []
+            for player in rankings:
+                if category_name.startswith("DNF"):
+                    score_text = f"{player.dnf_prediction} (off by {abs(player.dnf_prediction - self.actual_dnf_count)})"
+                elif category_name.startswith("Places"):
+                    places = player.places_gained_score or 0
+                    score_text = f"+{places}" if places >= 0 else f"{places}"
+                else:
+                    if self.team_points:
+                        pred_points = self.team_points.get(player.team_prediction, 0)
+                        score_text = f"{pred_points}pts"
+                    else:
+                        score_text = player.team_prediction[:8]
+                entries.append((player, score_text))
+            results.append((category_name, entries))
+        
+        return results
+    
+    def category_leaders(self) -> Dict[str, List[str]]:
+        """Players currently leading each category (ties included)"""
+        if not self.players:
+            return {}
+        
+        max_places = max(p.places_gained_score or 0 for p in self.players)
+        return {
+            'DNF': [p.name for p in self.players if p.dnf_score == 1],
+            'Team': [p.name for p in self.players if p.team_score == 1],
+            'Places Gained': [p.name for p in self.players if (p.places_gained_score or 0) == max_places]
+        }
+    
+    def publish_race_events(self):
+        """Diff the latest state against the previous snapshot and publish the events"""
+        snapshot = RaceSnapshot(dict(self.current_positions), set(self.dnf_drivers),
+                                dict(self.team_points), self.category_leaders())
+        
+        if self.last_snapshot is not None:
+            self.event_bus.publish(diff_snapshots(self.last_snapshot, snapshot))
+            self.show_race_events()
+        
+        self.last_snapshot = snapshot
+    
+    def show_race_events(self):
+        """Hook for front ends to redraw after new race events were logged"""
+        pass
+    
+    def log_race_event(self, event):
+        self.event_log.append(event.describe())
+        del self.event_log[:-50]
+    
+    def log_headline(self, event):
+        # Retirements and lead changes stay on the ticker while overtakes scroll past
+        self.headlines.append(event.describe())
+        del self.headlines[:-50]
+    
+    def ticker_text(self) -> str:
+        return " | ".join(self.headlines[-3:] + self.event_log[-3:])
+    
+    def calculate_current_standings(self):
+        if not self.starting_grid or not self.current_positions:
+            return
+        
+        for player in self.players:
+            total_places_gained = 0
+            for driver_name in player.assigned_drivers:
+                if driver_name not in self.dnf_drivers:
+                    if driver_name in self.starting_grid and driver_name in self.current_positions:
+                        start_pos = self.starting_grid[driver_name]
+                        current_pos = self.current_positions[driver_name]
+                        places_gained = start_pos - current_pos
+                        total_places_gained += places_gained
+            
+            player.places_gained_score = total_places_gained
+            
+            exact_dnf_players = [p for p in self.players if p.dnf_prediction == self.actual_dnf_count]
+            if exact_dnf_players:
+                player.dnf_score = 1 if player.dnf_prediction == self.actual_dnf_count else 0
+            else:
+                min_diff = min(abs(p.dnf_prediction - self.actual_dnf_count) for p in self.players)
+                player.dnf_score = 1 if abs(player.dnf_prediction - self.actual_dnf_count) == min_diff else 0
+            
+            if self.winning_team and self.team_points:
+                winning_points = self.team_points[self.winning_team]
+                predicted_points = self.team_points.get(player.team_prediction, 0)
+                
+                all_diffs = [(p, abs(self.team_points.get(p.team_prediction, 0) - winning_points)) for p in self.players]
+                min_team_diff = min(diff for _, diff in all_diffs)
+                
+                player_diff = abs(predicted_points - winning_points)
+                player.team_score = 1 if player_diff == min_team_diff else 0
+    
+    def calculate_final_results(self):
+        if not self.current_positions:
+            return
+        
+        for player in self.players:
+            exact_dnf_players = [p for p in self.players if p.dnf_prediction == self.actual_dnf_count]
+            if exact_dnf_players:
+                player.dnf_score = 1 if player.dnf_prediction == self.actual_dnf_count else 0
+            else:
+                min_diff = min(abs(p.dnf_prediction - self.actual_dnf_count) for p in self.players)
+                player.dnf_score = 1 if abs(player.dnf_prediction - self.actual_dnf_count) == min_diff else 0
+            
+            if self.winning_team and self.team_points:
+                winning_points = self.team_points[self.winning_team]
+                predicted_points = self.team_points.get(player.team_prediction, 0)
+                
+                all_diffs = [(p, abs(self.team_points.get(p.team_prediction, 0) - winning_points)) for p in self.players]
+                min_team_diff = min(diff for _, diff in all_diffs)
+                
+                player_diff = abs(predicted_points - winning_points)
+                player.team_score = 1 if player_diff == min_team_diff else 0
+            
+            total_places_gained = 0
+            for driver_name in player.assigned_drivers:
+                if driver_name not in self.dnf_drivers:
+                    if driver_name in self.starting_grid and driver_name in self.current_positions:
+                        start_pos = self.starting_grid[driver_name]
+                        final_pos = self.current_positions[driver_name]
+                        places_gained = start_pos - final_pos
+                        total_places_gained += places_gained
+            player.places_gained_score = total_places_gained
+        
+        self.category_winners = {'DNF': [], 'Team': [], 'Places Gained': []}
+        
+        for player in self.players:
+            if player.dnf_score == 1:
+                self.category_winners['DNF'].append(player.name)
+        
+        for player in self.players:
+            if player.team_score == 1:
+                self.category_winners['Team'].append(player.name)
+        
+        if self.players:
+            max_places = max(p.places_gained_score for p in self.players)
+            for player in self.players:
+                if player.places_gained_score == max_places:
+                    self.category_winners['Places Gained'].append(player.name)
+        
+        for player in self.players:
+            count = 0
+            if player.name in self.category_winners['DNF']:
+                count += 1
+            if player.name in self.category_winners['Team']:
+                count += 1
+            if player.name in self.category_winners['Places Gained']:
+                count += 1
+            player.categories_won = count
+        
+        self.players.sort(key=lambda p: p.categories_won, reverse=True)
+    
+    def final_results_text(self) -> str:
+        result_msg = "FINAL RACE RESULTS - SAO PAULO GP 2025\n\n"
+        
+        if self.team_points:
+            result_msg += "TEAM STANDINGS:\n"
+            sorted_teams = sorted(self.team_points.items(), key=lambda x: x[1], reverse=True)
+            for i, (team, points) in enumerate(sorted_teams[:3], 1):
+                medal = ["1st", "2nd", "3rd"][i-1]
+                result_msg += f"{medal} - {team}: {points} pts\n"
+            result_msg += "\n"
+        
+        result_msg += f"Total DNFs: {self.actual_dnf_count}\n"
+        if self.dnf_drivers:
+            result_msg += f"DNF'd Drivers: {', '.join(sorted(self.dnf_drivers))}\n\n"
+        else:
+            result_msg += "DNF'd Drivers: None\n\n"
+        
+        result_msg += "CATEGORY WINNERS:\n\n"
+        
+        for category, winners in self.category_winners.items():
+            if winners:
+                if len(winners) == 1:
+                    result_msg += f"{category}: {winners[0]}\n"
+                else:
+                    result_msg += f"{category}: {', '.join(winners)} (TIE)\n"
+            else:
+                result_msg += f"{category}: No winner\n"
+        
+        result_msg += f"\nOVERALL WINNER(S):\n"
+        top_categories = self.players[0].categories_won
+        overall_winners = [p.name for p in self.players if p.categories_won == top_categories]
+        
+        if len(overall_winners) == 1:
+            result_msg += f"{overall_winners[0]} with {top_categories} categor{'y' if top_categories == 1 else 'ies'} won!"
+        else:
+            result_msg += f"{', '.join(overall_winners)} (TIE) with {top_categories} categor{'y' if top_categories == 1 else 'ies'} won each!"
+        
+        return result_msg
+    
+    def save_backup_csv(self):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"f1_game_backup_{timestamp}.csv"
+        
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            
+            writer.writerow(['Phase', self.phase])
+            writer.writerow(['Refresh Count', self.refresh_count])
+            writer.writerow(['DNF Count', self.actual_dnf_count])
+            writer.writerow(['Winning Team', self.winning_team if self.winning_team else ''])
+            writer.writerow(['Timestamp', datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
+            writer.writerow([])
+            
+            if self.team_points:
+                writer.writerow(['Team Standings'])
+                writer.writerow(['Team', 'Points'])
+                for team, points in sorted(self.team_points.items(), key=lambda x: x[1], reverse=True):
+                    writer.writerow([team, points])
+                writer.writerow([])
+            
+            if self.dnf_drivers:
+                writer.writerow(['DNF Drivers'])
+                for driver in sorted(self.dnf_drivers):
+                    writer.writerow([driver])
+                writer.writerow([])
+            
+            writer.writerow(['Player', 'DNF Pred', 'Team Pred', 'Driver 1', 'Driver 2', 
+                           'DNF Score', 'Team Score', 'Places Gained', 'Categories Won'])
+            
+            for player in self.players:
+                writer.writerow([
+                    player.name,
+                    player.dnf_prediction,
+                    player.team_prediction,
+                    player.assigned_drivers[0] if len(player.assigned_drivers) > 0 else '',
+                    player.assigned_drivers[1] if len(player.assigned_drivers) > 1 else '',
+                    player.dnf_score if player.dnf_score is not None else '',
+                    player.team_score if player.team_score is not None else '',
+                    player.places_gained_score if player.places_gained_score is not None else '',
+                    player.categories_won if player.categories_won is not None else ''
+                ])
+            
+            writer.writerow([])
+            
+            if self.starting_grid:
+                writer.writerow(['Starting Grid'])
+                writer.writerow(['Driver', 'Position'])
+                for driver, pos in sorted(self.starting_grid.items(), key=lambda x: x[1]):
+                    writer.writerow([driver, pos])
+            
+            writer.writerow([])
+            
+            if self.current_positions:
+                writer.writerow(['Current Positions'])
+                writer.writerow(['Driver', 'Position'])
+                for driver, pos in sorted(self.current_positions.items(), key=lambda x: x[1]):
+                    writer.writerow([driver, pos])
+
 
-@dataclass
-class Player:
-    name: str
-    dnf_prediction: int
-    team_prediction: str
-    assigned_drivers: List[str]
-    dnf_score: Optional[int] = None
-    team_score: Optional[int] = None
-    places_gained_score: Optional[int] = None
-    categories_won: Optional[int] = None
+class PlayerCard:
+    """One reusable player card in the virtualized players grid"""
+    HEIGHT = 200
+    
+    def __init__(self, game):
+        self.game = game
+        self.index = None
+        card_bg = "#2d2d44"
+        
+        self.frame = tk.Frame(game.players_frame, bg=card_bg, 
+                              relief=tk.RAISED, borderwidth=2, width=420, height=self.HEIGHT)
+        self.frame.pack_propagate(False)
+        
+        header = tk.Frame(self.frame, bg=card_bg)
+        header.pack(fill=tk.X, padx=15, pady=8)
+        
+        self.title_label = tk.Label(header, font=("Arial", 15, "bold"),
+                                    bg=card_bg, fg=game.accent_color)
+        self.title_label.pack(side=tk.LEFT)
+        
+        self.remove_btn = tk.Button(header, text="X", command=lambda: game.remove_player(self.index),
+                                    bg="#ff4444", fg="white", font=("Arial", 12, "bold"),
+                                    relief=tk.FLAT, padx=8, pady=4)
+        
+        details = tk.Frame(self.frame, bg=card_bg)
+        details.pack(fill=tk.X, padx=15, pady=(0, 8))
+        
+        self.dnf_label = tk.Label(details, font=("Arial", 13), bg=card_bg, fg=game.fg_color)
+        self.dnf_label.pack(anchor=tk.W, pady=2)
+        self.team_label = tk.Label(details, font=("Arial", 13), bg=card_bg, fg=game.fg_color,
+                                   wraplength=380)
+        self.team_label.pack(anchor=tk.W, pady=2)
+        self.drivers_label = tk.Label(details, font=("Arial", 12, "italic"), bg=card_bg, fg="#aaa",
+                                      wraplength=380, justify=tk.LEFT)
+        self.drivers_label.pack(anchor=tk.W, pady=2)
+        
+        self.scores = tk.Frame(self.frame, bg=card_bg)
+        self.scores_label = tk.Label(self.scores, font=("Arial", 12), bg=card_bg, fg=game.fg_color)
+        self.scores_label.pack(anchor=tk.W, pady=1)
+        self.places_label = tk.Label(self.scores, font=("Arial", 12), bg=card_bg, fg=game.fg_color)
+        self.places_label.pack(anchor=tk.W, pady=1)
+        self.categories_label = tk.Label(self.scores, font=("Arial", 13, "bold"),
+                                         bg=card_bg, fg=game.success_color)
+        self.categories_label.pack(anchor=tk.W, pady=(3, 0))
+    
+    def show(self, index, player):
+        game = self.game
+        self.index = index
+        
+        self.title_label.config(text=f"#{index+1} {player.name}")
+        if game.phase == "betting":
+            self.remove_btn.pack(side=tk.RIGHT)
+        else:
+            self.remove_btn.pack_forget()
+        
+        self.dnf_label.config(text=f"DNF Prediction: {player.dnf_prediction}")
+        self.team_label.config(text=f"Team Prediction: {player.team_prediction}")
+        self.drivers_label.config(text=f"Drivers: {game.drivers_text(player)}")
+        
+        if game.phase in ["race", "finished"] and player.categories_won is not None:
+            self.scores_label.config(text=f"DNF: {player.dnf_score} | Team: {player.team_score}")
+            self.places_label.config(text=f"Places Gained: {player.places_gained_score}")
+            self.categories_label.config(text=f"Categories Won: {player.categories_won}")
+            self.scores.pack(fill=tk.X, padx=15, pady=(3, 8))
+        else:
+            self.scores.pack_forget()
+        
+        self.frame.grid()
+    
+    def hide(self):
+        self.index = None
+        self.frame.grid_remove()
 
 
-class F1PredictionGame:
+class F1PredictionGame(RaceGame):
+    GRID_COLUMNS = 3
+    
     def __init__(self, root):
+        super().__init__()
         self.root = root
         self.root.title("F1 Race Prediction Game - Sao Paulo GP 2025")
         self.root.geometry("1900x1080")
         
-        self.players = []
-        self.all_drivers = [name for name, team in DRIVER_CODES.values()]
-        self.teams = [
-            "Red Bull Racing", "Mercedes", "Ferrari", "McLaren",
-            "Aston Martin", "Alpine", "Williams", "Kick Sauber",
-            "Haas", "Racing Bulls"
-        ]
-        
-        self.phase = "betting"
-        self.starting_grid = {}
-        self.current_positions = {}
-        self.dnf_drivers = set()
-        self.team_points = {}
-        self.winning_team = None
-        self.category_winners = {}
-        self.refresh_count = 0
-        self.actual_dnf_count = 0
-        
         # Color scheme
         self.bg_color = "#1a1a2e"
         self.fg_color = "#eee"
@@ -92,73 +1367,10 @@ class F1PredictionGame:
         self.bronze_color = "#CD7F32"
         
         self.root.configure(bg=self.bg_color)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         self.create_widgets()
         
-    def scrape_live_positions(self, detect_dnf=False) -> Tuple[Dict[str, int], set, Dict[str, int]]:
-        """Scrape live positions from f1-dash.com"""
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        
-        try:
-            driver.get("https://f1-dash.com/dashboard")
-            time.sleep(1)
-            
-            html_content = driver.page_source
-            soup = BeautifulSoup(html_content, 'html.parser')
-            text_content = soup.get_text()
-            
-            driver_positions = []
-            
-            for code in DRIVER_CODES.keys():
-                index = text_content.find(code)
-                if index != -1:
-                    driver_positions.append((index, code))
-            
-            driver_positions.sort(key=lambda x: x[0])
-            
-            positions = {}
-            dnf_set = set()
-            team_points = {}
-            
-            for i, (pos_index, driver_code) in enumerate(driver_positions):
-                if len(positions) >= 20:
-                    break
-                
-                driver_name, team_name = DRIVER_CODES[driver_code]
-                
-                if detect_dnf:
-                    if i == len(driver_positions) - 1:
-                        next_section = text_content[pos_index:pos_index + 200]
-                        if "STOPPED" in next_section:
-                            dnf_set.add(driver_name)
-                    else:
-                        next_pos_index = driver_positions[i + 1][0]
-                        section_between = text_content[pos_index:next_pos_index]
-                        
-                        if "STOPPED" in section_between:
-                            dnf_set.add(driver_name)
-                
-                if driver_name not in dnf_set:
-                    race_position = len(positions) + 1
-                    positions[driver_name] = race_position
-                    
-                    if race_position in POINTS_SYSTEM:
-                        points = POINTS_SYSTEM[race_position]
-                        team_points[team_name] = team_points.get(team_name, 0) + points
-            
-            return positions, dnf_set, team_points
-            
-        finally:
-            driver.quit()
-    
     def create_widgets(self):
         # Title with GP name
         title_frame = tk.Frame(self.root, bg=self.bg_color)
@@ -189,6 +1401,12 @@ class F1PredictionGame:
                                    bg=self.bg_color, fg=self.gold_color)
         self.team_label.pack(pady=2)
         
+        # Latest race events
+        self.events_label = tk.Label(self.root, text="", 
+                                     font=("Arial", 12),
+                                     bg=self.bg_color, fg=self.fg_color)
+        self.events_label.pack(pady=2)
+        
         # BUTTONS AT TOP
         self.button_frame = tk.Frame(self.root, bg=self.bg_color)
         self.button_frame.pack(pady=12)
@@ -207,6 +1425,13 @@ class F1PredictionGame:
                  padx=20, pady=12)
         self.clear_btn.pack(side=tk.LEFT, padx=8)
         
+        self.import_btn = tk.Button(self.button_frame, text="Import Bets", 
+                 command=self.import_bets_file,
+                 bg=self.button_color, fg=self.fg_color,
+                 font=("Arial", 13, "bold"), relief=tk.FLAT,
+                 padx=20, pady=12)
+        self.import_btn.pack(side=tk.LEFT, padx=8)
+        
         self.lock_btn = tk.Button(self.button_frame, text="Lock Bets & Start Race", 
                  command=self.lock_bets_and_start_race,
                  bg=self.success_color, fg="white",
@@ -274,50 +1499,47 @@ class F1PredictionGame:
                                     relief=tk.RIDGE, borderwidth=3)
         right_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        # Scrollable players grid
-        canvas = tk.Canvas(right_frame, bg=self.bg_color, highlightthickness=0)
-        scrollbar = tk.Scrollbar(right_frame, orient="vertical", command=canvas.yview)
-        self.players_frame = tk.Frame(canvas, bg=self.bg_color)
-        
-        self.players_frame.bind("<Configure>", 
-                               lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        
-        canvas.create_window((0, 0), window=self.players_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        # Search box filters the grid by player name
+        search_frame = tk.Frame(right_frame, bg=self.bg_color)
+        search_frame.pack(fill=tk.X, padx=10, pady=(8, 0))
+        
+        tk.Label(search_frame, text="Search:", bg=self.bg_color,
+                fg=self.fg_color, font=("Arial", 13)).pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *args: self.update_players_display(reset_scroll=True))
+        tk.Entry(search_frame, textvariable=self.search_var,
+                font=("Arial", 13), width=24).pack(side=tk.LEFT, padx=8)
+        self.player_count_label = tk.Label(search_frame, text="", bg=self.bg_color,
+                                           fg="#aaa", font=("Arial", 12))
+        self.player_count_label.pack(side=tk.LEFT, padx=8)
+        
+        # Virtualized players grid: only the visible rows of cards exist as
+        # widgets and they are refilled with other players while scrolling
+        self.grid_scrollbar = tk.Scrollbar(right_frame, orient="vertical", command=self.scroll_players)
+        self.grid_scrollbar.pack(side="right", fill="y")
+        self.players_frame = tk.Frame(right_frame, bg=self.bg_color)
+        self.players_frame.pack(side="left", fill="both", expand=True, padx=10, pady=10)
+        self.players_frame.grid_propagate(False)
+        for col in range(self.GRID_COLUMNS):
+            self.players_frame.grid_columnconfigure(col, weight=1, minsize=420)
         
-        canvas.pack(side="left", fill="both", expand=True, padx=10, pady=10)
-        scrollbar.pack(side="right", fill="y")
+        self.card_pool = []
+        self.visible_players = []
+        self.grid_top_row = 0
+        self.players_frame.bind("<Configure>", lambda e: self.update_players_display())
+        self.root.bind_all("<MouseWheel>", lambda e: self.scroll_players("scroll", -1 if e.delta > 0 else 1, "units"))
+        self.root.bind_all("<Button-4>", lambda e: self.scroll_players("scroll", -1, "units"))
+        self.root.bind_all("<Button-5>", lambda e: self.scroll_players("scroll", 1, "units"))
     
     def update_category_leaderboard(self):
-        """Update the visual category leaderboard - SHOWS ALL PLAYERS"""
+        """Update the visual category leaderboard - top players of each category"""
         for widget in self.leaderboard_frame.winfo_children():
             widget.destroy()
         
         if self.phase not in ["race", "finished"]:
             return
         
-        dnf_rankings = sorted(self.players, 
-                             key=lambda p: abs(p.dnf_prediction - self.actual_dnf_count))
-        
-        places_rankings = sorted(self.players, 
-                                key=lambda p: p.places_gained_score if p.places_gained_score else 0, 
-                                reverse=True)
-        
-        if self.winning_team and self.team_points:
-            def team_closeness(player):
-                return self.team_points.get(player.team_prediction, 0)
-            
-            team_rankings = sorted(self.players, key=team_closeness, reverse=True)
-        else:
-            team_rankings = self.players.copy()
-        
-        categories = [
-            ("DNF Predictions", dnf_rankings),
-            ("Places Gained", places_rankings),
-            ("Team Predictions", team_rankings)
-        ]
-        
-        for i, (category_name, rankings) in enumerate(categories):
+        for i, (category_name, rankings) in enumerate(self.category_rankings()):
             row_frame = tk.Frame(self.leaderboard_frame, bg="#2d2d44", 
                                 relief=tk.RAISED, borderwidth=2)
             row_frame.pack(fill=tk.X, padx=12, pady=6)
@@ -327,8 +1549,8 @@ class F1PredictionGame:
                     bg="#2d2d44", 
                     fg=self.accent_color, width=18, anchor="w").pack(side=tk.LEFT, padx=8)
             
-            # Show ALL players
-            for j, player in enumerate(rankings):
+            # Large leagues only show the top of each category
+            for j, (player, score_text) in enumerate(rankings[:self.LEADERBOARD_TILES]):
                 if j == 0:
                     bg_color = self.gold_color
                     fg_color = "#000"
@@ -346,17 +1568,6 @@ class F1PredictionGame:
                     fg_color = self.fg_color
                     position_text = f"{j+1}th"
                 
-                if category_name.startswith("DNF"):
-                    score_text = f"{player.dnf_prediction} (off by {abs(player.dnf_prediction - self.actual_dnf_count)})"
-                elif category_name.startswith("Places"):
-                    score_text = f"+{player.places_gained_score}" if player.places_gained_score >= 0 else f"{player.places_gained_score}"
-                else:
-                    if self.team_points:
-                        pred_points = self.team_points.get(player.team_prediction, 0)
-                        score_text = f"{pred_points}pts"
-                    else:
-                        score_text = player.team_prediction[:8]
-                
                 tile = tk.Frame(row_frame, bg=bg_color, relief=tk.RAISED, borderwidth=2)
                 tile.pack(side=tk.LEFT, padx=4, pady=4)
                 
@@ -365,40 +1576,23 @@ class F1PredictionGame:
                         bg=bg_color, fg=fg_color).pack(padx=10, pady=3)
                 tk.Label(tile, text=score_text, 
                         font=("Arial", 12), bg=bg_color, fg=fg_color).pack(padx=10, pady=(0, 3))
+            
+            if len(rankings) > self.LEADERBOARD_TILES:
+                tk.Label(row_frame, text=f"+{len(rankings) - self.LEADERBOARD_TILES} more",
+                        font=("Arial", 12, "italic"), bg="#2d2d44", fg="#aaa").pack(side=tk.LEFT, padx=8)
     
     def add_player(self):
         if self.phase != "betting":
             messagebox.showwarning("Bets Locked", "Bets are already locked!")
             return
-            
-        if len(self.players) >= 10:
-            messagebox.showwarning("Limit Reached", "Maximum 10 players allowed!")
-            return
-        
-        name = self.name_entry.get().strip()
-        if not name:
-            messagebox.showwarning("Invalid Input", "Please enter player name!")
-            return
-        
-        dnf = int(self.dnf_spin.get())
-        team = self.team_combo.get()
-        
-        if not team:
-            messagebox.showwarning("Invalid Input", "Please select a team!")
-            return
-        
-        used_drivers = [d for p in self.players for d in p.assigned_drivers]
-        available = [d for d in self.all_drivers if d not in used_drivers]
         
-        if len(available) < 2:
-            messagebox.showwarning("Not Enough Drivers", 
-                "Not enough unique drivers available!")
+        try:
+            dnf = int(self.dnf_spin.get())
+            self.add_bet(self.name_entry.get(), dnf, self.team_combo.get())
+        except ValueError as e:
+            messagebox.showwarning("Invalid Input", str(e))
             return
         
-        assigned = random.sample(available, 2)
-        player = Player(name, dnf, team, assigned)
-        self.players.append(player)
-        
         self.update_players_display()
         
         self.name_entry.delete(0, tk.END)
@@ -406,76 +1600,64 @@ class F1PredictionGame:
         self.dnf_spin.insert(0, "0")
         self.team_combo.set('')
         
-    def update_players_display(self):
-        """Display players in 3-column grid"""
-        for widget in self.players_frame.winfo_children():
-            widget.destroy()
+    def visible_rows(self) -> int:
+        return max(1, self.players_frame.winfo_height() // (PlayerCard.HEIGHT + 16))
+    
+    def update_players_display(self, reset_scroll=False):
+        """Fill the pooled cards with the players in view, in a 3-column grid"""
+        query = self.search_var.get().strip().lower()
+        self.visible_players = [i for i, p in enumerate(self.players) if query in p.name.lower()]
+        
+        rows = self.visible_rows()
+        total_rows = (len(self.visible_players) + self.GRID_COLUMNS - 1) // self.GRID_COLUMNS
+        if reset_scroll:
+            self.grid_top_row = 0
+        self.grid_top_row = max(0, min(self.grid_top_row, total_rows - rows))
+        
+        # Grow the pool when the window gets taller, never per player
+        while len(self.card_pool) < rows * self.GRID_COLUMNS:
+            slot = len(self.card_pool)
+            card = PlayerCard(self)
+            card.frame.grid(row=slot // self.GRID_COLUMNS, column=slot % self.GRID_COLUMNS,
+                            padx=10, pady=8, sticky="nsew")
+            self.card_pool.append(card)
+        
+        first = self.grid_top_row * self.GRID_COLUMNS
+        for slot, card in enumerate(self.card_pool):
+            position = first + slot
+            if slot < rows * self.GRID_COLUMNS and position < len(self.visible_players):
+                index = self.visible_players[position]
+                card.show(index, self.players[index])
+            else:
+                card.hide()
         
-        # Create grid: 3 columns, up to 4 rows
-        for i, player in enumerate(self.players):
-            row = i // 3
-            col = i % 3
-            
-            player_card = tk.Frame(self.players_frame, bg="#2d2d44", 
-                                  relief=tk.RAISED, borderwidth=2, width=420, height=180)
-            player_card.grid(row=row, column=col, padx=10, pady=8, sticky="nsew")
-            
-            # Make columns expand equally
-            self.players_frame.grid_columnconfigure(col, weight=1, minsize=420)
-            
-            header = tk.Frame(player_card, bg="#2d2d44")
-            header.pack(fill=tk.X, padx=15, pady=8)
-            
-            tk.Label(header, text=f"#{i+1} {player.name}", 
-                    font=("Arial", 15, "bold"),
-                    bg="#2d2d44", 
-                    fg=self.accent_color).pack(side=tk.LEFT)
-            
-            if self.phase == "betting":
-                tk.Button(header, text="X", command=lambda idx=i: self.remove_player(idx),
-                         bg="#ff4444", fg="white", font=("Arial", 12, "bold"),
-                         relief=tk.FLAT, padx=8, pady=4).pack(side=tk.RIGHT)
-            
-            details = tk.Frame(player_card, bg="#2d2d44")
-            details.pack(fill=tk.X, padx=15, pady=(0, 8))
-            
-            tk.Label(details, text=f"DNF Prediction: {player.dnf_prediction}",
-                    font=("Arial", 13), bg="#2d2d44", fg=self.fg_color).pack(anchor=tk.W, pady=2)
-            tk.Label(details, text=f"Team Prediction: {player.team_prediction}",
-                    font=("Arial", 13), bg="#2d2d44", fg=self.fg_color, 
-                    wraplength=380).pack(anchor=tk.W, pady=2)
-            
-            driver_text = ""
-            for driver in player.assigned_drivers:
-                if driver in self.dnf_drivers:
-                    driver_text += f"[DNF] {driver}, "
-                else:
-                    driver_text += f"{driver}, "
-            driver_text = driver_text.rstrip(", ")
-            
-            tk.Label(details, text=f"Drivers: {driver_text}",
-                    font=("Arial", 12, "italic"), bg="#2d2d44", fg="#aaa", 
-                    wraplength=380).pack(anchor=tk.W, pady=2)
-            
-            if self.phase in ["race", "finished"] and player.categories_won is not None:
-                scores = tk.Frame(player_card, bg="#2d2d44")
-                scores.pack(fill=tk.X, padx=15, pady=(3, 8))
-                
-                tk.Label(scores, text=f"DNF: {player.dnf_score} | Team: {player.team_score}",
-                        font=("Arial", 12), bg="#2d2d44", 
-                        fg=self.fg_color).pack(anchor=tk.W, pady=1)
-                tk.Label(scores, text=f"Places Gained: {player.places_gained_score}",
-                        font=("Arial", 12), bg="#2d2d44", 
-                        fg=self.fg_color).pack(anchor=tk.W, pady=1)
-                
-                categories_text = f"Categories Won: {player.categories_won}"
-                tk.Label(scores, text=categories_text,
-                        font=("Arial", 13, "bold"),
-                        bg="#2d2d44", 
-                        fg=self.success_color).pack(anchor=tk.W, pady=(3, 0))
+        if total_rows:
+            self.grid_scrollbar.set(self.grid_top_row / total_rows,
+                                    min(1.0, (self.grid_top_row + rows) / total_rows))
+        else:
+            self.grid_scrollbar.set(0, 1)
+        
+        shown = len(self.visible_players)
+        self.player_count_label.config(
+            text=f"{shown} of {len(self.players)} players" if query else f"{len(self.players)} players")
+    
+    def scroll_players(self, action, amount, unit=None):
+        """Scrollbar and mouse wheel handler, moving the grid a row or a page at a time"""
+        rows = self.visible_rows()
+        total_rows = (len(self.visible_players) + self.GRID_COLUMNS - 1) // self.GRID_COLUMNS
+        
+        if action == "moveto":
+            top_row = int(float(amount) * total_rows)
+        else:
+            top_row = self.grid_top_row + int(amount) * (rows if unit == "pages" else 1)
+        
+        top_row = max(0, min(top_row, total_rows - rows))
+        if top_row != self.grid_top_row:
+            self.grid_top_row = top_row
+            self.update_players_display()
     
     def remove_player(self, idx):
-        if self.phase != "betting":
+        if self.phase != "betting" or idx is None:
             return
         del self.players[idx]
         self.update_players_display()
@@ -489,18 +1671,35 @@ class F1PredictionGame:
             messagebox.showinfo("No Players", "Add some players first!")
             return
         
-        if len(self.all_drivers) < len(self.players) * 2:
-            messagebox.showwarning("Not Enough Drivers", "Not enough drivers!")
+        self.shuffle_drivers()
+        
+        self.update_players_display()
+        messagebox.showinfo("Success", "All drivers randomized!")
+    
+    def import_bets_file(self):
+        if self.phase != "betting":
+            messagebox.showwarning("Bets Locked", "Bets are already locked!")
+            return
+        
+        path = filedialog.askopenfilename(title="Import Bets",
+                                          filetypes=[("Bet files", "*.csv *.json"), ("All files", "*.*")])
+        if not path:
             return
         
-        shuffled = self.all_drivers.copy()
-        random.shuffle(shuffled)
-        
-        for i, player in enumerate(self.players):
-            player.assigned_drivers = shuffled[i*2:(i*2)+2]
+        try:
+            imported = self.import_bets(path)
+        except BetImportError as e:
+            shown = "\n".join(e.errors[:20])
+            if len(e.errors) > 20:
+                shown += f"\n...and {len(e.errors) - 20} more"
+            messagebox.showerror("Import Failed", f"No bets imported, {len(e.errors)} invalid row(s):\n\n{shown}")
+            return
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Import Failed", f"Could not read {path}: {e}")
+            return
         
         self.update_players_display()
-        messagebox.showinfo("Success", "All drivers randomized!")
+        messagebox.showinfo("Success", f"Imported {len(imported)} players!")
     
     def clear_all(self):
         if self.phase != "betting":
@@ -517,22 +1716,23 @@ class F1PredictionGame:
             messagebox.showwarning("No Players", "Add some players first!")
             return
         
-        if not messagebox.askyesno("Lock Bets", 
-            "Lock all bets and fetch starting grid?\nThis will take ~15 seconds."):
+        grid_file = self.choose_classification_file(
+            "Lock Bets", "Lock all bets?", "qualifying classification", GRID_FILE)
+        if grid_file is None:
             return
         
-        self.phase_label.config(text="Fetching starting grid from f1-dash.com...")
+        self.phase_label.config(text=f"Loading starting grid from {os.path.basename(grid_file)}..." if grid_file
+                                else "Fetching starting grid from f1-dash.com...")
         self.root.update()
         
         def fetch_grid():
             try:
-                self.starting_grid, _, _ = self.scrape_live_positions(detect_dnf=False)
+                self.start_race(self.load_starting_grid(grid_file))
                 self.save_backup_csv()
                 
-                self.phase = "race"
                 self.phase_label.config(text="RACE IN PROGRESS - Use Refresh Button", 
                                        fg="#FFA500")
-                self.refresh_label.config(text=f"Refreshes: {self.refresh_count} | DNFs: {self.actual_dnf_count}")
+                self.refresh_label.config(text=f"Refreshes: {self.refresh_count} | DNFs: {self.actual_dnf_count} | {self.scraper.status_text()}")
                 
                 self.leaderboard_frame.pack(pady=10, padx=30, fill=tk.X, after=self.button_frame)
                 
@@ -542,6 +1742,7 @@ class F1PredictionGame:
                 self.team_combo.config(state=tk.DISABLED)
                 self.randomize_btn.config(state=tk.DISABLED)
                 self.clear_btn.config(state=tk.DISABLED)
+                self.import_btn.config(state=tk.DISABLED)
                 self.lock_btn.config(state=tk.DISABLED)
                 
                 # Add new buttons to existing button_frame at top
@@ -559,16 +1760,6 @@ class F1PredictionGame:
                          padx=30, pady=14)
                 self.finish_race_btn.pack(side=tk.LEFT, padx=8)
                 
-                self.actual_dnf_count = 0
-                self.dnf_drivers = set()
-                self.team_points = {}
-                self.winning_team = None
-                for player in self.players:
-                    player.places_gained_score = 0
-                    player.dnf_score = 0
-                    player.team_score = 0
-                    player.categories_won = 0
-                
                 self.update_category_leaderboard()
                 
                 messagebox.showinfo("Success", 
@@ -590,23 +1781,23 @@ class F1PredictionGame:
         
         def fetch_and_update():
             try:
-                self.current_positions, self.dnf_drivers, self.team_points = self.scrape_live_positions(detect_dnf=True)
-                self.actual_dnf_count = len(self.dnf_drivers)
+                self.apply_positions(*self.scrape_live_positions(detect_dnf=True))
                 
                 if self.team_points:
-                    self.winning_team = max(self.team_points.items(), key=lambda x: x[1])[0]
                     winning_points = self.team_points[self.winning_team]
                     self.team_label.config(text=f"Leading Team: {self.winning_team} ({winning_points} pts)")
                 
                 self.refresh_count += 1
                 self.calculate_current_standings()
+                self.publish_race_events()
                 self.save_backup_csv()
                 
-                self.refresh_label.config(text=f"Refreshes: {self.refresh_count} | Last: {datetime.now().strftime('%H:%M:%S')} | DNFs: {self.actual_dnf_count}")
+                self.refresh_label.config(text=f"Refreshes: {self.refresh_count} | Last: {datetime.now().strftime('%H:%M:%S')} | DNFs: {self.actual_dnf_count} | {self.scraper.status_text()}")
                 self.update_players_display()
                 self.update_category_leaderboard()
                 
             except Exception as e:
+                self.refresh_label.config(text=f"Refresh failed | {self.scraper.status_text()}")
                 messagebox.showerror("Error", f"Failed to refresh: {e}")
         
         thread = threading.Thread(target=fetch_and_update)
@@ -615,7 +1806,9 @@ class F1PredictionGame:
     
     def finish_race(self):
         """Finish race"""
-        if not messagebox.askyesno("Finish Race", "Finalize race results?"):
+        results_file = self.choose_classification_file(
+            "Finish Race", "Finalize race results?", "final classification", RESULTS_FILE)
+        if results_file is None:
             return
         
         self.refresh_label.config(text="Fetching final positions...")
@@ -623,15 +1816,14 @@ class F1PredictionGame:
         
         def finalize():
             try:
-                self.current_positions, self.dnf_drivers, self.team_points = self.scrape_live_positions(detect_dnf=True)
-                self.actual_dnf_count = len(self.dnf_drivers)
+                self.apply_positions(*self.load_final_results(results_file))
                 
                 if self.team_points:
-                    self.winning_team = max(self.team_points.items(), key=lambda x: x[1])[0]
                     winning_points = self.team_points[self.winning_team]
                     self.team_label.config(text=f"Winning Team: {self.winning_team} ({winning_points} pts)")
                 
                 self.calculate_final_results()
+                self.publish_race_events()
                 self.save_backup_csv()
                 
                 self.phase = "finished"
@@ -652,199 +1844,449 @@ class F1PredictionGame:
         thread.daemon = True
         thread.start()
     
-    def calculate_current_standings(self):
-        if not self.starting_grid or not self.current_positions:
+    def choose_classification_file(self, title, question, kind, configured):
+        """Ask where positions come from: a classification file or f1-dash.
+        Returns the file path, "" to scrape live, or None when cancelled"""
+        if configured:
+            return configured if messagebox.askyesno(title, f"{question}\nUsing {kind} file {configured}") else None
+        
+        answer = messagebox.askyesnocancel(title, 
+            f"{question}\n\nYes: load the {kind} from a CSV/JSON file\n"
+            f"No: fetch it from f1-dash.com (~15 seconds)")
+        if answer is None:
+            return None
+        if not answer:
+            return ""
+        
+        path = filedialog.askopenfilename(title=f"Select {kind} file",
+                                          filetypes=[("Classification files", "*.csv *.json"), ("All files", "*.*")])
+        return path or None
+    
+    def on_close(self):
+        self.close()
+        self.root.destroy()
+    
+    def show_race_events(self):
+        self.events_label.config(text=self.ticker_text())
+    
+    def show_final_results(self):
+        messagebox.showinfo("Final Results", self.final_results_text())
+
+
+
+def char_width(ch) -> int:
+    if unicodedata.combining(ch):
+        return 0
+    return 2 if unicodedata.east_asian_width(ch) in ("W", "F") else 1
+
+
+def fit_width(text, width) -> Tuple[str, int]:
+    """Longest printable prefix of text that fits in width screen columns, and its width"""
+    fitted = []
+    used = 0
+    for ch in text:
+        if not ch.isprintable():
+            ch = " "
+        size = char_width(ch)
+        if used + size > width:
+            break
+        fitted.append(ch)
+        used += size
+    return "".join(fitted), used
+
+
+class TerminalScreen:
+    """Curses screen that only repaints the lines that changed since the last frame"""
+    def __init__(self, stdscr):
+        self.stdscr = stdscr
+        self.lines = []
+        self.size = None
+    
+    def draw(self, lines):
+        """Draw the lines, the last one holding the input cursor at its end"""
+        height, width = self.stdscr.getmaxyx()
+        if (height, width) != self.size:
+            self.stdscr.clear()
+            self.lines = []
+            self.size = (height, width)
+        
+        # Cut by screen columns, wide (e.g. CJK) characters take two
+        fitted = [fit_width(line, width - 1) for line in lines[:height]]
+        lines = [line for line, _ in fitted]
+        
+        for row in range(max(len(lines), len(self.lines))):
+            new = lines[row] if row < len(lines) else ""
+            old = self.lines[row] if row < len(self.lines) else ""
+            if new != old:
+                try:
+                    self.stdscr.move(row, 0)
+                    self.stdscr.clrtoeol()
+                    self.stdscr.addstr(row, 0, new)
+                except curses.error:
+                    pass
+        
+        self.lines = lines
+        try:
+            if fitted:
+                self.stdscr.move(len(fitted) - 1, min(fitted[-1][1], width - 1))
+            self.stdscr.refresh()
+        except curses.error:
+            pass
+
+
+class TerminalGame(RaceGame):
+    """Text front end for headless machines and SSH sessions"""
+    CARD_WIDTH = 44
+    CARD_HEIGHT = 5
+    HELP = [
+        "Commands:",
+        "  add <name> <dnf> <team>   add a player (quote names with spaces)",
+        "  import <file>             add every bet from a CSV or JSON file",
+        "  rand | clear              randomize drivers / remove all players",
+        "  find [text]               filter the players by name (no text shows all)",
+        "  lock [grid file]          lock bets (grid from a qualifying file or f1-dash)",
+        "  refresh | finish [file]   race phases (final results from a file or f1-dash)",
+        "  quit                      exit (PgUp/PgDn scroll the players)"
+    ]
+    
+    def __init__(self, stdscr):
+        super().__init__()
+        self.stdscr = stdscr
+        self.screen = TerminalScreen(stdscr)
+        self.input_buffer = ""
+        self.status = ""
+        self.message = ["Type 'help' for commands"]
+        self.scroll = 0
+        self.search = ""
+        self.pending_confirmation = None
+        self.busy = False
+        self.results = queue.Queue()
+        self.running = True
+    
+    def run(self):
+        self.stdscr.timeout(200)
+        while self.running:
+            self.drain_results()
+            self.render()
+            try:
+                key = self.stdscr.get_wch()
+            except curses.error:
+                continue
+            self.handle_key(key)
+    
+    def handle_key(self, key):
+        if key in ("\n", "\r", curses.KEY_ENTER):
+            command, self.input_buffer = self.input_buffer, ""
+            self.run_command(command)
+        elif key in ("\b", "\x7f", curses.KEY_BACKSPACE):
+            self.input_buffer = self.input_buffer[:-1]
+        elif key == curses.KEY_PPAGE:
+            self.scroll = max(0, self.scroll - 1)
+        elif key == curses.KEY_NPAGE:
+            self.scroll += 1
+        elif isinstance(key, str) and key.isprintable():
+            self.input_buffer += key
+    
+    def run_command(self, command):
+        try:
+            args = shlex.split(command)
+        except ValueError as e:
+            self.message = [f"Invalid command: {e}"]
             return
         
-        for player in self.players:
-            total_places_gained = 0
-            for driver_name in player.assigned_drivers:
-                if driver_name not in self.dnf_drivers:
-                    if driver_name in self.starting_grid and driver_name in self.current_positions:
-                        start_pos = self.starting_grid[driver_name]
-                        current_pos = self.current_positions[driver_name]
-                        places_gained = start_pos - current_pos
-                        total_places_gained += places_gained
-            
-            player.places_gained_score = total_places_gained
-            
-            exact_dnf_players = [p for p in self.players if p.dnf_prediction == self.actual_dnf_count]
-            if exact_dnf_players:
-                player.dnf_score = 1 if player.dnf_prediction == self.actual_dnf_count else 0
-            else:
-                min_diff = min(abs(p.dnf_prediction - self.actual_dnf_count) for p in self.players)
-                player.dnf_score = 1 if abs(player.dnf_prediction - self.actual_dnf_count) == min_diff else 0
-            
-            if self.winning_team and self.team_points:
-                winning_points = self.team_points[self.winning_team]
-                predicted_points = self.team_points.get(player.team_prediction, 0)
-                
-                all_diffs = [(p, abs(self.team_points.get(p.team_prediction, 0) - winning_points)) for p in self.players]
-                min_team_diff = min(diff for _, diff in all_diffs)
-                
-                player_diff = abs(predicted_points - winning_points)
-                player.team_score = 1 if player_diff == min_team_diff else 0
-    
-    def calculate_final_results(self):
-        if not self.current_positions:
+        if not args:
             return
         
-        for player in self.players:
-            exact_dnf_players = [p for p in self.players if p.dnf_prediction == self.actual_dnf_count]
-            if exact_dnf_players:
-                player.dnf_score = 1 if player.dnf_prediction == self.actual_dnf_count else 0
+        confirm, self.pending_confirmation = self.pending_confirmation, None
+        if confirm is not None:
+            if args[0].lower() in ("y", "yes"):
+                confirm()
             else:
-                min_diff = min(abs(p.dnf_prediction - self.actual_dnf_count) for p in self.players)
-                player.dnf_score = 1 if abs(player.dnf_prediction - self.actual_dnf_count) == min_diff else 0
-            
-            if self.winning_team and self.team_points:
-                winning_points = self.team_points[self.winning_team]
-                predicted_points = self.team_points.get(player.team_prediction, 0)
-                
-                all_diffs = [(p, abs(self.team_points.get(p.team_prediction, 0) - winning_points)) for p in self.players]
-                min_team_diff = min(diff for _, diff in all_diffs)
-                
-                player_diff = abs(predicted_points - winning_points)
-                player.team_score = 1 if player_diff == min_team_diff else 0
-            
-            total_places_gained = 0
-            for driver_name in player.assigned_drivers:
-                if driver_name not in self.dnf_drivers:
-                    if driver_name in self.starting_grid and driver_name in self.current_positions:
-                        start_pos = self.starting_grid[driver_name]
-                        final_pos = self.current_positions[driver_name]
-                        places_gained = start_pos - final_pos
-                        total_places_gained += places_gained
-            player.places_gained_score = total_places_gained
+                self.message = ["Cancelled"]
+            return
         
-        self.category_winners = {'DNF': [], 'Team': [], 'Places Gained': []}
+        try:
+            self.dispatch(args[0].lower(), args[1:])
+        except Exception as e:
+            # A failing command must never take the whole session down
+            self.message = [f"{args[0]} failed: {type(e).__name__}: {e}"]
+    
+    def dispatch(self, name, args):
+        if name in ("q", "quit", "exit"):
+            self.running = False
+        elif name in ("h", "help", "?"):
+            self.message = list(self.HELP)
+        elif name == "add":
+            self.add_player(args)
+        elif name in ("rand", "randomize"):
+            self.randomize_all_drivers()
+        elif name == "import":
+            self.import_bets_file(args)
+        elif name == "find":
+            self.search = " ".join(args).lower()
+            self.scroll = 0
+            self.message = [f"Showing players matching '{self.search}'" if self.search else "Showing all players"]
+        elif name == "clear":
+            self.clear_all()
+        elif name == "lock":
+            self.lock_bets_and_start_race(args[0] if args else GRID_FILE)
+        elif name in ("r", "refresh"):
+            self.refresh_positions()
+        elif name == "finish":
+            self.finish_race(args[0] if args else RESULTS_FILE)
+        else:
+            self.message = [f"Unknown command: {name} (type 'help')"]
+    
+    def match_team(self, text) -> str:
+        matches = [team for team in self.teams if team.lower().startswith(text.lower())]
+        exact = [team for team in matches if team.lower() == text.lower()]
+        if exact:
+            return exact[0]
+        return matches[0] if len(matches) == 1 else ""
+    
+    def add_player(self, args):
+        if self.phase != "betting":
+            self.message = ["Bets are already locked!"]
+            return
         
-        for player in self.players:
-            if player.dnf_score == 1:
-                self.category_winners['DNF'].append(player.name)
+        if len(args) < 3:
+            self.message = ["Usage: add <name> <dnf> <team>"]
+            return
         
-        for player in self.players:
-            if player.team_score == 1:
-                self.category_winners['Team'].append(player.name)
+        try:
+            player = self.add_bet(args[0], int(args[1]), self.match_team(" ".join(args[2:])))
+        except ValueError as e:
+            self.message = [str(e)]
+            return
         
-        if self.players:
-            max_places = max(p.places_gained_score for p in self.players)
-            for player in self.players:
-                if player.places_gained_score == max_places:
-                    self.category_winners['Places Gained'].append(player.name)
+        self.message = [f"Added {player.name}: {', '.join(player.assigned_drivers)}"]
+    
+    def randomize_all_drivers(self):
+        if self.phase != "betting":
+            self.message = ["Bets are already locked!"]
+        elif not self.players:
+            self.message = ["Add some players first!"]
+        else:
+            self.shuffle_drivers()
+            self.message = ["All drivers randomized!"]
+    
+    def import_bets_file(self, args):
+        if self.phase != "betting":
+            self.message = ["Bets are already locked!"]
+            return
         
-        for player in self.players:
-            count = 0
-            if player.name in self.category_winners['DNF']:
-                count += 1
-            if player.name in self.category_winners['Team']:
-                count += 1
-            if player.name in self.category_winners['Places Gained']:
-                count += 1
-            player.categories_won = count
+        if len(args) != 1:
+            self.message = ["Usage: import <bets.csv|bets.json>"]
+            return
         
-        self.players.sort(key=lambda p: p.categories_won, reverse=True)
+        try:
+            imported = self.import_bets(args[0])
+        except BetImportError as e:
+            self.message = [f"No bets imported, {len(e.errors)} invalid row(s):"] + e.errors
+            return
+        except (OSError, ValueError) as e:
+            self.message = [f"Could not read {args[0]}: {e}"]
+            return
+        
+        self.message = [f"Imported {len(imported)} players!"]
     
-    def show_final_results(self):
-        result_msg = "FINAL RACE RESULTS - SAO PAULO GP 2025\n\n"
+    def clear_all(self):
+        if self.phase != "betting":
+            self.message = ["Cannot clear after bets are locked!"]
+            return
         
-        if self.team_points:
-            result_msg += "TEAM STANDINGS:\n"
-            sorted_teams = sorted(self.team_points.items(), key=lambda x: x[1], reverse=True)
-            for i, (team, points) in enumerate(sorted_teams[:3], 1):
-                medal = ["1st", "2nd", "3rd"][i-1]
-                result_msg += f"{medal} - {team}: {points} pts\n"
-            result_msg += "\n"
+        def clear():
+            self.players = []
+            self.scroll = 0
+            self.message = ["All players cleared"]
         
-        result_msg += f"Total DNFs: {self.actual_dnf_count}\n"
-        if self.dnf_drivers:
-            result_msg += f"DNF'd Drivers: {', '.join(sorted(self.dnf_drivers))}\n\n"
-        else:
-            result_msg += "DNF'd Drivers: None\n\n"
+        self.pending_confirmation = clear
+        self.message = [f"Clear all {len(self.players)} players? Type 'y' to confirm"]
+    
+    def run_in_background(self, status, fetch, on_done, error_text):
+        """Run a slow fetch off the input loop and hand its result back to it"""
+        if self.busy:
+            self.message = ["Still fetching, please wait..."]
+            return
         
-        result_msg += "CATEGORY WINNERS:\n\n"
+        self.busy = True
+        self.status = status
         
-        for category, winners in self.category_winners.items():
-            if winners:
-                if len(winners) == 1:
-                    result_msg += f"{category}: {winners[0]}\n"
-                else:
-                    result_msg += f"{category}: {', '.join(winners)} (TIE)\n"
+        def worker():
+            try:
+                self.results.put((on_done, fetch(), None))
+            except Exception as e:
+                self.results.put((on_done, None, f"{error_text}: {e}"))
+        
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+    
+    def drain_results(self):
+        while True:
+            try:
+                on_done, result, error = self.results.get_nowait()
+            except queue.Empty:
+                return
+            
+            self.busy = False
+            if error:
+                self.status = self.scraper.status_text()
+                self.message = error.splitlines()
             else:
-                result_msg += f"{category}: No winner\n"
+                on_done(result)
+    
+    def lock_bets_and_start_race(self, grid_file=None):
+        if self.phase != "betting":
+            self.message = ["Bets are already locked!"]
+            return
         
-        result_msg += f"\nOVERALL WINNER(S):\n"
-        top_categories = self.players[0].categories_won
-        overall_winners = [p.name for p in self.players if p.categories_won == top_categories]
+        if not self.players:
+            self.message = ["Add some players first!"]
+            return
         
-        if len(overall_winners) == 1:
-            result_msg += f"{overall_winners[0]} with {top_categories} categor{'y' if top_categories == 1 else 'ies'} won!"
-        else:
-            result_msg += f"{', '.join(overall_winners)} (TIE) with {top_categories} categor{'y' if top_categories == 1 else 'ies'} won each!"
+        self.run_in_background(f"Loading starting grid from {grid_file}..." if grid_file
+                               else "Fetching starting grid from f1-dash.com...",
+                               lambda: self.load_starting_grid(grid_file),
+                               self.on_grid_fetched, "Failed to fetch starting grid")
+    
+    def on_grid_fetched(self, starting_grid):
+        self.start_race(starting_grid)
+        self.save_backup_csv()
         
-        messagebox.showinfo("Final Results", result_msg)
+        self.status = f"Refreshes: {self.refresh_count} | DNFs: {self.actual_dnf_count} | {self.scraper.status_text()}"
+        self.message = [f"Starting grid saved! {len(self.starting_grid)} drivers found."]
     
-    def save_backup_csv(self):
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"f1_game_backup_{timestamp}.csv"
+    def refresh_positions(self):
+        if self.phase != "race":
+            self.message = ["Lock bets before refreshing!"]
+            return
         
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            
-            writer.writerow(['Phase', self.phase])
-            writer.writerow(['Refresh Count', self.refresh_count])
-            writer.writerow(['DNF Count', self.actual_dnf_count])
-            writer.writerow(['Winning Team', self.winning_team if self.winning_team else ''])
-            writer.writerow(['Timestamp', datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
-            writer.writerow([])
-            
-            if self.team_points:
-                writer.writerow(['Team Standings'])
-                writer.writerow(['Team', 'Points'])
-                for team, points in sorted(self.team_points.items(), key=lambda x: x[1], reverse=True):
-                    writer.writerow([team, points])
-                writer.writerow([])
-            
-            if self.dnf_drivers:
-                writer.writerow(['DNF Drivers'])
-                for driver in sorted(self.dnf_drivers):
-                    writer.writerow([driver])
-                writer.writerow([])
-            
-            writer.writerow(['Player', 'DNF Pred', 'Team Pred', 'Driver 1', 'Driver 2', 
-                           'DNF Score', 'Team Score', 'Places Gained', 'Categories Won'])
-            
-            for player in self.players:
-                writer.writerow([
-                    player.name,
-                    player.dnf_prediction,
-                    player.team_prediction,
-                    player.assigned_drivers[0] if len(player.assigned_drivers) > 0 else '',
-                    player.assigned_drivers[1] if len(player.assigned_drivers) > 1 else '',
-                    player.dnf_score if player.dnf_score is not None else '',
-                    player.team_score if player.team_score is not None else '',
-                    player.places_gained_score if player.places_gained_score is not None else '',
-                    player.categories_won if player.categories_won is not None else ''
-                ])
-            
-            writer.writerow([])
-            
-            if self.starting_grid:
-                writer.writerow(['Starting Grid'])
-                writer.writerow(['Driver', 'Position'])
-                for driver, pos in sorted(self.starting_grid.items(), key=lambda x: x[1]):
-                    writer.writerow([driver, pos])
-            
-            writer.writerow([])
-            
-            if self.current_positions:
-                writer.writerow(['Current Positions'])
-                writer.writerow(['Driver', 'Position'])
-                for driver, pos in sorted(self.current_positions.items(), key=lambda x: x[1]):
-                    writer.writerow([driver, pos])
+        self.run_in_background("Refreshing positions...",
+                               lambda: self.scrape_live_positions(detect_dnf=True),
+                               self.on_positions_fetched, "Failed to refresh")
+    
+    def on_positions_fetched(self, result):
+        self.apply_positions(*result)
+        self.refresh_count += 1
+        self.calculate_current_standings()
+        self.publish_race_events()
+        self.save_backup_csv()
+        
+        self.status = f"Refreshes: {self.refresh_count} | Last: {datetime.now().strftime('%H:%M:%S')} | DNFs: {self.actual_dnf_count} | {self.scraper.status_text()}"
+        self.message = []
+    
+    def finish_race(self, results_file=None):
+        if self.phase != "race":
+            self.message = ["The race has not started!"]
+            return
+        
+        self.run_in_background("Fetching final positions...",
+                               lambda: self.load_final_results(results_file),
+                               self.on_final_positions, "Failed to finalize")
+    
+    def on_final_positions(self, result):
+        self.apply_positions(*result)
+        self.calculate_final_results()
+        self.publish_race_events()
+        self.save_backup_csv()
+        
+        self.phase = "finished"
+        self.status = f"Final results saved | DNFs: {self.actual_dnf_count}"
+        self.message = self.final_results_text().splitlines()
+    
+    def leaderboard_lines(self) -> List[str]:
+        lines = ["LIVE CATEGORY LEADERBOARD"]
+        for category_name, rankings in self.category_rankings():
+            tiles = []
+            for j, (player, score_text) in enumerate(rankings[:self.LEADERBOARD_TILES]):
+                position_text = ["1st", "2nd", "3rd"][j] if j < 3 else f"{j+1}th"
+                tiles.append(f"{position_text}: {player.name} {score_text}")
+            if len(rankings) > self.LEADERBOARD_TILES:
+                tiles.append(f"+{len(rankings) - self.LEADERBOARD_TILES} more")
+            lines.append(f"{category_name:<18}" + " | ".join(tiles))
+        return lines
+    
+    def player_card(self, i, player) -> List[str]:
+        card = [
+            f"#{i+1} {player.name}",
+            f"DNF Prediction: {player.dnf_prediction} | Team: {player.team_prediction}",
+            f"Drivers: {self.drivers_text(player)}"
+        ]
+        if self.phase in ["race", "finished"] and player.categories_won is not None:
+            card.append(f"DNF: {player.dnf_score} | Team: {player.team_score} | "
+                        f"Places: {player.places_gained_score} | Won: {player.categories_won}")
+        return card
+    
+    def player_lines(self, width, rows) -> List[str]:
+        """Player cards laid out in as many columns as fit, starting at the scroll row"""
+        players = [(i, p) for i, p in enumerate(self.players) if self.search in p.name.lower()]
+        columns = max(1, width // self.CARD_WIDTH)
+        total_rows = (len(players) + columns - 1) // columns
+        self.scroll = min(self.scroll, max(0, total_rows - max(1, rows // self.CARD_HEIGHT)))
+        
+        lines = []
+        for row in range(self.scroll, total_rows):
+            cards = [self.player_card(i, player) for i, player in players[row * columns:(row + 1) * columns]]
+            for line in range(self.CARD_HEIGHT):
+                lines.append("".join(
+                    (card[line] if line < len(card) else "")[:self.CARD_WIDTH - 2].ljust(self.CARD_WIDTH)
+                    for card in cards).rstrip())
+            if len(lines) >= rows:
+                break
+        return lines
+    
+    def render(self):
+        height, width = self.stdscr.getmaxyx()
+        phase_text = {
+            "betting": f"PHASE 1: Placing Bets ({len(self.players)} players)",
+            "race": "RACE IN PROGRESS - type 'refresh'",
+            "finished": "RACE FINISHED"
+        }[self.phase]
+        
+        lines = ["SAO PAULO GRAND PRIX 2025 - F1 Race Prediction Game", phase_text, self.status]
+        if self.winning_team and self.team_points:
+            lines.append(f"Leading Team: {self.winning_team} ({self.team_points[self.winning_team]} pts)")
+        if self.event_log or self.headlines:
+            lines.append(self.ticker_text())
+        lines.append("")
+        
+        if self.phase in ["race", "finished"]:
+            lines.extend(self.leaderboard_lines())
+            lines.append("")
+        
+        if self.message:
+            lines.extend(self.message)
+            lines.append("")
+        
+        body_rows = height - 1
+        lines.extend(self.player_lines(width, body_rows - len(lines)))
+        lines = lines[:body_rows] + [""] * (body_rows - len(lines))
+        
+        # Keep the end of a long input visible
+        prompt = "> " + self.input_buffer
+        while len(prompt) > 2 and fit_width(prompt, width - 1)[0] != prompt:
+            prompt = "> " + prompt[3:]
+        self.screen.draw(lines + [prompt])
+
+
+def run_terminal():
+    if curses is None:
+        sys.exit("The terminal UI needs the curses module (pip install windows-curses on Windows)")
+    def main(stdscr):
+        game = TerminalGame(stdscr)
+        try:
+            game.run()
+        finally:
+            game.close()
+    
+    curses.wrapper(main)
 
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = F1PredictionGame(root)
-    root.mainloop()
+    if "--tui" in sys.argv or tk is None:
+        run_terminal()
+    else:
+        root = tk.Tk()
+        app = F1PredictionGame(root)
+        root.mainloop()